@@ -0,0 +1,197 @@
+import asyncio
+import hmac
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from pydantic import BaseModel, Field
+
+from app import tracing
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEBUG_PROFILE_MAX_SECONDS = float(os.getenv("DEBUG_PROFILE_MAX_SECONDS", "60"))
+DEBUG_PROFILE_INTERVAL_SECONDS = float(os.getenv("DEBUG_PROFILE_INTERVAL_SECONDS", "0.005"))
+DEBUG_LOOP_LAG_MONITOR = os.getenv("DEBUG_LOOP_LAG_MONITOR", "0").strip() not in {
+    "0",
+    "false",
+    "False",
+}
+DEBUG_LOOP_LAG_INTERVAL_SECONDS = float(os.getenv("DEBUG_LOOP_LAG_INTERVAL_SECONDS", "0.5"))
+DEBUG_LOOP_LAG_THRESHOLD_MS = float(os.getenv("DEBUG_LOOP_LAG_THRESHOLD_MS", "100"))
+
+
+def require_admin(x_admin_token: str = Header(default="")) -> None:
+    expected = os.getenv("ADMIN_TOKEN", "").strip()
+    if not expected:
+        # No admin token configured: the debug surface does not exist.
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+class LoopLagMonitor:
+    def __init__(
+        self,
+        interval_seconds: float = DEBUG_LOOP_LAG_INTERVAL_SECONDS,
+        threshold_ms: float = DEBUG_LOOP_LAG_THRESHOLD_MS,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.threshold_ms = threshold_ms
+        self.samples = 0
+        self.stalls = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.recent_stalls: deque[dict[str, float]] = deque(maxlen=50)
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def record(self, lag_ms: float) -> None:
+        self.samples += 1
+        self.last_lag_ms = round(lag_ms, 3)
+        self.max_lag_ms = max(self.max_lag_ms, self.last_lag_ms)
+        if lag_ms >= self.threshold_ms:
+            self.stalls += 1
+            self.recent_stalls.append({"at": time.time(), "lag_ms": self.last_lag_ms})
+            logger.warning("Event loop stalled for %.1f ms", lag_ms)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "interval_seconds": self.interval_seconds,
+            "threshold_ms": self.threshold_ms,
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+            "recent_stalls": list(self.recent_stalls),
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self.record(max(0.0, (loop.time() - expected) * 1000))
+
+
+loop_lag_monitor = LoopLagMonitor()
+_profile_lock = asyncio.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{os.path.basename(code.co_filename)}:{name}"
+
+
+def sample_stacks(
+    duration_seconds: float,
+    interval_seconds: float,
+    thread_id: int,
+) -> Counter[str]:
+    # Runs on a helper thread and samples another thread's stack, so the profiled
+    # event loop keeps serving requests and pays no per-call instrumentation cost.
+    stacks: Counter[str] = Counter()
+    deadline = time.monotonic() + duration_seconds
+    while time.monotonic() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            stacks[";".join(reversed(labels))] += 1
+        time.sleep(interval_seconds)
+    return stacks
+
+
+class TracingConfig(BaseModel):
+    sample_rate: float | None = Field(default=None, ge=0, le=1)
+    buffer_size: int | None = Field(default=None, ge=1)
+    loop_lag_monitor: bool | None = None
+
+
+def _status() -> dict[str, Any]:
+    return {
+        "tracing": {
+            "sample_rate": tracing.get_sample_rate(),
+            "buffer_size": tracing.buffer_size(),
+            "buffered_traces": len(tracing.recent_traces()),
+        },
+        "loop_lag": loop_lag_monitor.status(),
+    }
+
+
+@router.get("/status", dependencies=[Depends(require_admin)])
+def debug_status():
+    return _status()
+
+
+@router.post("/tracing", dependencies=[Depends(require_admin)])
+async def configure_tracing(config: TracingConfig):
+    if config.sample_rate is not None:
+        tracing.set_sample_rate(config.sample_rate)
+    if config.buffer_size is not None:
+        tracing.set_buffer_size(config.buffer_size)
+    if config.loop_lag_monitor is True:
+        loop_lag_monitor.start()
+    elif config.loop_lag_monitor is False:
+        loop_lag_monitor.stop()
+    return _status()
+
+
+@router.get("/traces", dependencies=[Depends(require_admin)])
+def export_traces():
+    return Response(content=tracing.export_jsonl(), media_type="application/x-ndjson")
+
+
+@router.delete("/traces", dependencies=[Depends(require_admin)])
+def clear_traces():
+    tracing.clear_traces()
+    return {"ok": True}
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def capture_profile(seconds: float = 10.0, interval_ms: float | None = None):
+    if not 0 < seconds <= DEBUG_PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"seconds must be in (0, {DEBUG_PROFILE_MAX_SECONDS:g}]",
+        )
+    interval_seconds = DEBUG_PROFILE_INTERVAL_SECONDS
+    if interval_ms is not None:
+        interval_seconds = max(0.001, interval_ms / 1000)
+
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        stacks = await asyncio.to_thread(
+            sample_stacks,
+            seconds,
+            interval_seconds,
+            threading.get_ident(),
+        )
+
+    # Collapsed-stack format: load into speedscope or flamegraph.pl directly.
+    lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+    return Response(content="\n".join(lines) + "\n", media_type="text/plain")
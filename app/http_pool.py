@@ -0,0 +1,33 @@
+import os
+
+import httpx
+
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "100"))
+HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_POOL_DEFAULT_TIMEOUT_SECONDS = float(os.getenv("HTTP_POOL_DEFAULT_TIMEOUT_SECONDS", "20"))
+
+# One pooled client per upstream, shared by every tenant; created lazily on first use.
+_clients: dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=HTTP_POOL_DEFAULT_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
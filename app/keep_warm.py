@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Awaitable
+
+import httpx
+
+from app.ollama_client import (
+    OLLAMA_BASE_URL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_MODEL,
+    OLLAMA_WARMUP_ON_STARTUP,
+    OLLAMA_WARMUP_TIMEOUT_SECONDS,
+    keep_alive_ollama,
+    loaded_ollama_models,
+    model_last_used,
+    user_requests_in_flight,
+)
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_KEEP_WARM_ENABLED = os.getenv("OLLAMA_KEEP_WARM_ENABLED", "1").strip() not in {
+    "0",
+    "false",
+    "False",
+}
+OLLAMA_KEEP_WARM_MODELS = os.getenv("OLLAMA_KEEP_WARM_MODELS", "")
+OLLAMA_KEEP_WARM_INTERVAL_SECONDS = float(os.getenv("OLLAMA_KEEP_WARM_INTERVAL_SECONDS", "60"))
+OLLAMA_KEEP_WARM_MARGIN_SECONDS = float(os.getenv("OLLAMA_KEEP_WARM_MARGIN_SECONDS", "120"))
+
+# Ollama's own default when keep_alive is not sent.
+_OLLAMA_DEFAULT_KEEP_ALIVE_SECONDS = 300.0
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+STATE_UNKNOWN = "unknown"
+STATE_WARM = "warm"
+STATE_COLD = "cold"
+
+
+# Accepts the same forms as Ollama's keep_alive: seconds, or a Go duration such as "1h30m".
+# None means a negative value, i.e. the model never unloads.
+def parse_keep_alive_seconds(value: str) -> float | None:
+    text = (value or "").strip()
+    if not text:
+        return _OLLAMA_DEFAULT_KEEP_ALIVE_SECONDS
+
+    negative = text.startswith("-")
+    body = text[1:] if negative else text
+    try:
+        seconds = float(body)
+    except ValueError:
+        parts = _DURATION_PART.findall(body)
+        if not parts or "".join(number + unit for number, unit in parts) != body:
+            raise ValueError(f"Invalid OLLAMA_KEEP_ALIVE duration: {value}")
+        seconds = sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+    if negative:
+        return None
+    return seconds
+
+
+def _normalize_model_name(model: str) -> str:
+    name = model.strip()
+    return name if ":" in name else f"{name}:latest"
+
+
+@dataclass
+class ModelWarmth:
+    base_url: str
+    model: str
+    state: str = STATE_UNKNOWN
+    last_warmed: float | None = None
+    last_checked: float | None = None
+    seen_warm: bool = False
+    detail: str = ""
+
+    def as_dict(self) -> dict[str, object]:
+        last_used = model_last_used(self.base_url, self.model)
+        now = time.monotonic()
+        return {
+            "backend": self.base_url,
+            "model": self.model,
+            "state": self.state,
+            "last_used_seconds_ago": None if last_used is None else round(now - last_used, 1),
+            "detail": self.detail,
+        }
+
+
+class KeepWarmScheduler:
+    def __init__(
+        self,
+        targets: list[tuple[str, str]],
+        *,
+        keep_alive_seconds: float | None,
+        interval_seconds: float = OLLAMA_KEEP_WARM_INTERVAL_SECONDS,
+        margin_seconds: float = OLLAMA_KEEP_WARM_MARGIN_SECONDS,
+        request_timeout_seconds: float = OLLAMA_WARMUP_TIMEOUT_SECONDS,
+        warm_unused: bool = True,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._models = [ModelWarmth(base_url=url, model=model) for url, model in targets]
+        self._keep_alive_seconds = keep_alive_seconds
+        self._interval_seconds = interval_seconds
+        # A refresh is only attempted once per tick, so the margin must cover a whole interval.
+        self._margin_seconds = max(margin_seconds, interval_seconds)
+        self._request_timeout_seconds = request_timeout_seconds
+        self._warm_unused = warm_unused
+        self._transport = transport
+        self._unreachable_backends: set[str] = set()
+
+    def status(self) -> list[dict[str, object]]:
+        return [warmth.as_dict() for warmth in self._models]
+
+    def cold_models(self) -> list[str]:
+        return [warmth.model for warmth in self._models if warmth.state == STATE_COLD]
+
+    def model_state(self, model: str, base_url: str = OLLAMA_BASE_URL) -> str:
+        for warmth in self._models:
+            if warmth.base_url == base_url and warmth.model == model.strip():
+                return warmth.state
+        return STATE_UNKNOWN
+
+    async def run(self, after: Awaitable[object] | None = None) -> None:
+        if after is not None:
+            # Let the startup warmup finish first so both never load the same model at once.
+            await asyncio.wait([asyncio.ensure_future(after)])
+        while True:
+            try:
+                await self.check_once()
+            except Exception as exc:
+                logger.warning("Ollama keep-warm check failed: %s", exc)
+            await asyncio.sleep(self._interval_seconds)
+
+    async def check_once(self) -> None:
+        # Keep-warm traffic has the lowest priority: ongoing user requests keep models loaded anyway.
+        if user_requests_in_flight() > 0:
+            return
+
+        # A small dedicated pool so keep-warm never takes connections from user requests.
+        limits = httpx.Limits(max_connections=1, max_keepalive_connections=1)
+        async with httpx.AsyncClient(
+            timeout=self._request_timeout_seconds,
+            limits=limits,
+            transport=self._transport,
+        ) as client:
+            loaded_by_backend: dict[str, dict[str, float | None] | None] = {}
+            for base_url in {warmth.base_url for warmth in self._models}:
+                try:
+                    loaded_by_backend[base_url] = await loaded_ollama_models(client, base_url)
+                except httpx.HTTPError as exc:
+                    self._mark_backend_unreachable(base_url, exc)
+
+            for warmth in self._models:
+                if warmth.base_url not in loaded_by_backend:
+                    continue
+                restarted = warmth.base_url in self._unreachable_backends
+                await self._check_model(client, warmth, loaded_by_backend[warmth.base_url], restarted)
+
+            for base_url in loaded_by_backend:
+                if base_url in self._unreachable_backends:
+                    logger.info("Ollama backend is reachable again: %s", base_url)
+                    self._unreachable_backends.discard(base_url)
+
+    async def _check_model(
+        self,
+        client: httpx.AsyncClient,
+        warmth: ModelWarmth,
+        loaded: dict[str, float | None] | None,
+        restarted: bool,
+    ) -> None:
+        warmth.last_checked = time.monotonic()
+        if restarted:
+            self._set_state(warmth, STATE_COLD, "backend restarted")
+            expiring = False
+        elif loaded is not None:
+            expiring = self._update_from_loaded(warmth, loaded)
+        else:
+            expiring = self._update_from_estimate(warmth)
+
+        if warmth.state == STATE_WARM:
+            warmth.seen_warm = True
+            if expiring:
+                await self._refresh(client, warmth)
+        elif warmth.state == STATE_COLD and self._should_rewarm(warmth):
+            await self._refresh(client, warmth)
+
+    def _should_rewarm(self, warmth: ModelWarmth) -> bool:
+        # With warm_unused off, only models that served traffic or were warm before get reloaded.
+        if self._warm_unused or warmth.seen_warm:
+            return True
+        return model_last_used(warmth.base_url, warmth.model) is not None
+
+    def _update_from_loaded(self, warmth: ModelWarmth, loaded: dict[str, float | None]) -> bool:
+        name = _normalize_model_name(warmth.model)
+        matches = [value for key, value in loaded.items() if _normalize_model_name(key) == name]
+        if not matches:
+            self._set_state(warmth, STATE_COLD, "not loaded")
+            return False
+
+        self._set_state(warmth, STATE_WARM)
+        expires_at = matches[0]
+        return expires_at is not None and expires_at - time.time() <= self._margin_seconds
+
+    def _update_from_estimate(self, warmth: ModelWarmth) -> bool:
+        touched = [
+            value
+            for value in (model_last_used(warmth.base_url, warmth.model), warmth.last_warmed)
+            if value is not None
+        ]
+        if not touched:
+            self._set_state(warmth, STATE_COLD, "never loaded")
+            return False
+
+        if self._keep_alive_seconds is None:
+            self._set_state(warmth, STATE_WARM)
+            return False
+
+        remaining = max(touched) + self._keep_alive_seconds - time.monotonic()
+        if remaining <= 0:
+            self._set_state(warmth, STATE_COLD, "keep_alive expired")
+            return False
+
+        self._set_state(warmth, STATE_WARM)
+        return remaining <= self._margin_seconds
+
+    @staticmethod
+    def _set_state(warmth: ModelWarmth, state: str, detail: str = "") -> None:
+        warmth.state = state
+        warmth.detail = detail
+
+    async def _refresh(self, client: httpx.AsyncClient, warmth: ModelWarmth) -> None:
+        if user_requests_in_flight() > 0:
+            return
+        try:
+            await keep_alive_ollama(client, warmth.base_url, warmth.model)
+        except httpx.HTTPError as exc:
+            logger.warning("Ollama keep-warm failed for model %s: %s", warmth.model, exc)
+            self._set_state(warmth, STATE_COLD, f"keep-warm failed: {exc}")
+            return
+
+        if warmth.state == STATE_COLD:
+            logger.info("Ollama model re-warmed: %s (%s)", warmth.model, warmth.detail)
+        self._set_state(warmth, STATE_WARM)
+        warmth.seen_warm = True
+        warmth.last_warmed = time.monotonic()
+
+    def _mark_backend_unreachable(self, base_url: str, exc: Exception) -> None:
+        if base_url not in self._unreachable_backends:
+            logger.warning("Ollama backend unreachable: %s (%s)", base_url, exc)
+        self._unreachable_backends.add(base_url)
+        for warmth in self._models:
+            if warmth.base_url == base_url:
+                self._set_state(warmth, STATE_COLD, "backend unreachable")
+                warmth.last_checked = time.monotonic()
+
+
+def _configured_models() -> list[str]:
+    models = [OLLAMA_MODEL.strip()]
+    for raw_model in OLLAMA_KEEP_WARM_MODELS.split(","):
+        model = raw_model.strip()
+        if model and model not in models:
+            models.append(model)
+    return models
+
+
+@lru_cache(maxsize=1)
+def get_keep_warm_scheduler() -> KeepWarmScheduler:
+    return KeepWarmScheduler(
+        [(OLLAMA_BASE_URL, model) for model in _configured_models()],
+        keep_alive_seconds=parse_keep_alive_seconds(OLLAMA_KEEP_ALIVE),
+        # OLLAMA_WARMUP_ON_STARTUP=0 opts out of loading models before they are used.
+        warm_unused=OLLAMA_WARMUP_ON_STARTUP,
+    )
+
+
+def keep_warm_enabled() -> bool:
+    if not OLLAMA_KEEP_WARM_ENABLED:
+        return False
+    # keep_alive=0 asks Ollama to unload right after each request; keeping warm would fight that.
+    return parse_keep_alive_seconds(OLLAMA_KEEP_ALIVE) != 0
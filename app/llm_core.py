@@ -1,34 +1,43 @@
-import os
 from functools import lru_cache
 
 from app.guardrail import GuardrailEngine
 from app.ollama_client import ollama_chat
-from app.prompt_runtime import get_prompt_runtime
+from app.prompt_runtime import GuardrailSettings, get_prompt_runtime
+from app.tenants import Tenant, get_tenant_registry
+from app.tracing import span
 
-PROMPT_PROFILE = os.getenv("PROMPT_PROFILE", "wechat")
 
+@lru_cache(maxsize=None)
+def _guardrail_engine_for(settings: GuardrailSettings) -> GuardrailEngine:
+    return GuardrailEngine(settings)
 
-@lru_cache(maxsize=1)
-def _get_guardrail_engine() -> GuardrailEngine:
-    runtime = get_prompt_runtime()
-    return GuardrailEngine(runtime.guardrail_settings)
 
+def get_guardrail_engine(tenant: Tenant | None = None) -> GuardrailEngine:
+    runtime = tenant.prompt_runtime() if tenant is not None else get_prompt_runtime()
+    return _guardrail_engine_for(runtime.guardrail_settings)
 
-async def generate_reply(user_id: str, text: str) -> str:
-    runtime = get_prompt_runtime()
-    guardrail = _get_guardrail_engine()
 
-    input_result = guardrail.check_input(text)
+async def generate_reply(user_id: str, text: str, tenant: Tenant | None = None) -> str:
+    tenant = tenant or get_tenant_registry().default
+    runtime = tenant.prompt_runtime()
+    guardrail = get_guardrail_engine(tenant)
+
+    with span("guardrail.check_input"):
+        input_result = guardrail.check_input(text)
     if input_result.blocked:
         return input_result.text
 
-    system_prompt = runtime.system_prompt(PROMPT_PROFILE)
-    user_prompt = runtime.render_user_prompt(
-        profile=PROMPT_PROFILE,
-        user_text=input_result.text,
-        user_id=user_id,
-        context={"channel": "wechat_mp"},
-    )
+    with span("render_prompt"):
+        system_prompt = runtime.system_prompt(tenant.prompt_profile)
+        user_prompt = runtime.render_user_prompt(
+            profile=tenant.prompt_profile,
+            user_text=input_result.text,
+            user_id=user_id,
+            context={"channel": "wechat_mp"},
+        )
+
+    with span("ollama_chat"):
+        raw_output = await ollama_chat(system_prompt=system_prompt, user_prompt=user_prompt)
 
-    raw_output = await ollama_chat(system_prompt=system_prompt, user_prompt=user_prompt)
-    return guardrail.sanitize_output(raw_output)
+    with span("guardrail.sanitize_output"):
+        return guardrail.sanitize_output(raw_output)
@@ -1,27 +1,91 @@
+import asyncio
 import logging
 
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 load_dotenv()
 
 from app.wechat import router as wechat_router
-from app.ollama_client import warmup_ollama
-from app.prompt_runtime import get_prompt_runtime
+from app.debug import DEBUG_LOOP_LAG_MONITOR, loop_lag_monitor, router as debug_router
+from app.http_pool import close_http_clients
+from app.keep_warm import STATE_WARM, get_keep_warm_scheduler, keep_warm_enabled
+from app.llm_core import get_guardrail_engine
+from app.ollama_client import OLLAMA_MODEL, OLLAMA_WARMUP_ON_STARTUP, warmup_ollama
+from app.tenants import get_tenant_registry
 
 app = FastAPI(title="Ollama WeChat MP Gateway")
 logger = logging.getLogger(__name__)
 
 app.include_router(wechat_router, prefix="/wechat")
+app.include_router(debug_router, prefix="/debug")
+
+_warmup_task: asyncio.Task[bool] | None = None
+_keep_warm_task: asyncio.Task[None] | None = None
 
 
 @app.on_event("startup")
 async def validate_prompt_runtime() -> None:
-    runtime = get_prompt_runtime()
-    logger.info("Prompt config loaded from: %s", runtime.source_path)
-    await warmup_ollama()
+    global _warmup_task, _keep_warm_task
+
+    for tenant in get_tenant_registry().tenants:
+        runtime = tenant.prompt_runtime()
+        runtime.system_prompt(tenant.prompt_profile)
+        get_guardrail_engine(tenant)
+        logger.info("Prompt config for tenant %s loaded from: %s", tenant.name, runtime.source_path)
+
+    # Warmup can take as long as a model load; run it beside the server and expose it via /ready.
+    _warmup_task = asyncio.create_task(warmup_ollama())
+
+    if keep_warm_enabled():
+        _keep_warm_task = asyncio.create_task(get_keep_warm_scheduler().run(after=_warmup_task))
+
+    if DEBUG_LOOP_LAG_MONITOR:
+        loop_lag_monitor.start()
+
+
+@app.on_event("shutdown")
+async def cancel_background_tasks() -> None:
+    for task in (_keep_warm_task, _warmup_task):
+        if task is not None and not task.done():
+            task.cancel()
+    loop_lag_monitor.stop()
+    await close_http_clients()
+
+
+def _warmup_status() -> str:
+    if not OLLAMA_WARMUP_ON_STARTUP:
+        return "disabled"
+    if _warmup_task is None or not _warmup_task.done():
+        return "pending"
+    if _warmup_task.cancelled() or _warmup_task.exception() is not None:
+        return "failed"
+    return "ok" if _warmup_task.result() else "failed"
 
 
 @app.get("/health")
 def health():
     return {"ok": True}
+
+
+@app.get("/ready")
+def ready(response: Response):
+    warmup = _warmup_status()
+    # A failed warmup means Ollama is unreachable or still loading: this instance can only
+    # answer with timeout/error text, so keep it out of rotation.
+    is_ready = warmup in {"ok", "disabled"}
+
+    scheduler = get_keep_warm_scheduler() if keep_warm_enabled() else None
+    if scheduler is not None and warmup != "disabled":
+        # Keep-warm knows whether the model is loaded right now (eviction, Ollama restart),
+        # and can bring it back after a failed warmup, so its view decides readiness.
+        is_ready = warmup != "pending" and scheduler.model_state(OLLAMA_MODEL) == STATE_WARM
+
+    if not is_ready:
+        response.status_code = 503
+
+    payload: dict[str, object] = {"ready": is_ready, "warmup": warmup}
+    if scheduler is not None:
+        payload["models"] = scheduler.status()
+        payload["cold_models"] = scheduler.cold_models()
+    return payload
@@ -1,9 +1,13 @@
 import logging
 import os
+import time
+from datetime import datetime
 from typing import Any
 
 import httpx
 
+from app.http_pool import get_http_client
+
 logger = logging.getLogger(__name__)
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
@@ -20,6 +24,21 @@ OLLAMA_WARMUP_ON_STARTUP = os.getenv("OLLAMA_WARMUP_ON_STARTUP", "1").strip() no
 }
 OLLAMA_WARMUP_TIMEOUT_SECONDS = float(os.getenv("OLLAMA_WARMUP_TIMEOUT_SECONDS", "15"))
 
+_model_last_used: dict[tuple[str, str], float] = {}
+_user_requests_in_flight = 0
+
+
+def model_last_used(base_url: str, model: str) -> float | None:
+    return _model_last_used.get((base_url, model.strip()))
+
+
+def user_requests_in_flight() -> int:
+    return _user_requests_in_flight
+
+
+def _record_model_use(base_url: str, model: str) -> None:
+    _model_last_used[(base_url, model.strip())] = time.monotonic()
+
 
 def _build_payload(model: str, prompt: str) -> dict[str, Any]:
     payload: dict[str, Any] = {
@@ -43,17 +62,23 @@ async def ollama_chat(*, system_prompt: str, user_prompt: str) -> str:
     payload = _build_payload(active_model, final_prompt)
     url = f"{OLLAMA_BASE_URL}/api/generate"
 
-    async with httpx.AsyncClient(timeout=OPENCLAW_REPLY_TIMEOUT_SECONDS) as client:
-        response = await client.post(url, json=payload)
+    global _user_requests_in_flight
+    _user_requests_in_flight += 1
+    try:
+        client = get_http_client("ollama")
+        response = await client.post(url, json=payload, timeout=OPENCLAW_REPLY_TIMEOUT_SECONDS)
         response.raise_for_status()
         data = response.json()
+    finally:
+        _user_requests_in_flight -= 1
 
+    _record_model_use(OLLAMA_BASE_URL, active_model)
     return (data.get("response") or "").strip() or "I could not generate a valid reply."
 
 
-async def warmup_ollama(model: str | None = None) -> None:
+async def warmup_ollama(model: str | None = None) -> bool:
     if not OLLAMA_WARMUP_ON_STARTUP:
-        return
+        return False
 
     active_model = (model or OLLAMA_MODEL).strip()
     payload = _build_payload(active_model, "warmup")
@@ -61,9 +86,45 @@ async def warmup_ollama(model: str | None = None) -> None:
     url = f"{OLLAMA_BASE_URL}/api/generate"
 
     try:
-        async with httpx.AsyncClient(timeout=OLLAMA_WARMUP_TIMEOUT_SECONDS) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            logger.info("Ollama warmup succeeded for model: %s", active_model)
+        client = get_http_client("ollama")
+        response = await client.post(url, json=payload, timeout=OLLAMA_WARMUP_TIMEOUT_SECONDS)
+        response.raise_for_status()
+        logger.info("Ollama warmup succeeded for model: %s", active_model)
+        _record_model_use(OLLAMA_BASE_URL, active_model)
     except Exception as exc:
         logger.warning("Ollama warmup failed for model %s: %s", active_model, exc)
+        return False
+    return True
+
+
+async def keep_alive_ollama(client: httpx.AsyncClient, base_url: str, model: str) -> None:
+    # An empty prompt only loads the model and resets its keep_alive timer; no tokens are generated.
+    payload: dict[str, Any] = {"model": model.strip(), "prompt": "", "stream": False}
+    if OLLAMA_KEEP_ALIVE:
+        payload["keep_alive"] = OLLAMA_KEEP_ALIVE
+    response = await client.post(f"{base_url}/api/generate", json=payload)
+    response.raise_for_status()
+
+
+async def loaded_ollama_models(
+    client: httpx.AsyncClient,
+    base_url: str,
+) -> dict[str, float | None] | None:
+    # Maps loaded model names to their unload epoch; None means this Ollama has no /api/ps.
+    response = await client.get(f"{base_url}/api/ps")
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+
+    loaded: dict[str, float | None] = {}
+    for item in response.json().get("models") or []:
+        name = str(item.get("name") or item.get("model") or "").strip()
+        if not name:
+            continue
+        expires_at = None
+        try:
+            expires_at = datetime.fromisoformat(str(item.get("expires_at"))).timestamp()
+        except ValueError:
+            pass
+        loaded[name] = expires_at
+    return loaded
@@ -1,14 +1,16 @@
+import hashlib
+import json
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from functools import lru_cache
 from pathlib import Path
 from typing import Any, Mapping
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
+PROMPT_SNAPSHOT_VERSION = 1
+
 
 @dataclass(frozen=True)
 class PromptProfile:
@@ -137,12 +139,39 @@ def _resolve_prompt_config_path() -> Path:
     )
 
 
-def _read_yaml(path: Path) -> dict[str, Any]:
-    raw = yaml.safe_load(path.read_text(encoding="utf-8"))
+def _resolve_prompt_snapshot_path() -> Path | None:
+    from_env = os.getenv("PROMPT_SNAPSHOT_PATH", "").strip()
+    if not from_env:
+        return None
+    return _resolve_path(from_env)
+
+
+def prompt_snapshot_path_for(config_path: Path) -> Path:
+    # Tenant prompt configs keep their snapshot next to the YAML: foo.private.yaml ->
+    # foo.private.snapshot.json. PROMPT_SNAPSHOT_PATH only applies to the default config.
+    return config_path.with_name(f"{config_path.stem}.snapshot.json")
+
+
+def _source_digest(source_bytes: bytes) -> str:
+    return hashlib.sha256(source_bytes).hexdigest()
+
+
+def _read_yaml(
+    path: Path,
+    source_bytes: bytes | None = None,
+    kind: str = "Prompt config",
+) -> dict[str, Any]:
+    # PyYAML is only needed when no valid snapshot exists, so keep it off the import path.
+    import yaml
+
+    if source_bytes is None:
+        source_bytes = path.read_bytes()
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    raw = yaml.load(source_bytes.decode("utf-8"), Loader=loader)
     if raw is None:
         return {}
     if not isinstance(raw, dict):
-        raise ValueError(f"Prompt config root must be a mapping: {path}")
+        raise ValueError(f"{kind} root must be a mapping: {path}")
     return raw
 
 
@@ -197,10 +226,7 @@ def _to_guardrail_settings(raw_guardrail: Any) -> GuardrailSettings:
     )
 
 
-def load_prompt_settings() -> PromptSettings:
-    source_path = _resolve_prompt_config_path()
-    raw = _read_yaml(source_path)
-
+def _parse_prompt_settings(source_path: Path, raw: Mapping[str, Any]) -> PromptSettings:
     raw_profiles = raw.get("profiles")
     if not isinstance(raw_profiles, dict) or not raw_profiles:
         raise ValueError("Prompt config must include a non-empty 'profiles' mapping.")
@@ -226,11 +252,151 @@ def load_prompt_settings() -> PromptSettings:
     )
 
 
+def _settings_to_snapshot(settings: PromptSettings, digest: str) -> dict[str, Any]:
+    return {
+        "version": PROMPT_SNAPSHOT_VERSION,
+        "source_sha256": digest,
+        "default_profile": settings.default_profile,
+        "profiles": {name: asdict(profile) for name, profile in settings.profiles.items()},
+        "guardrail": asdict(settings.guardrail),
+    }
+
+
+def _settings_from_snapshot(source_path: Path, snapshot: Mapping[str, Any]) -> PromptSettings:
+    guardrail = dict(snapshot["guardrail"])
+    for key in ("blocked_input_patterns", "blocked_output_patterns", "redaction_patterns"):
+        guardrail[key] = tuple(guardrail[key])
+
+    return PromptSettings(
+        source_path=source_path,
+        default_profile=snapshot["default_profile"],
+        profiles={
+            name: PromptProfile(**profile) for name, profile in snapshot["profiles"].items()
+        },
+        guardrail=GuardrailSettings(**guardrail),
+    )
+
+
+def _load_prompt_snapshot(
+    snapshot_path: Path,
+    source_path: Path,
+    digest: str,
+) -> PromptSettings | None:
+    if not snapshot_path.exists():
+        logger.info("Prompt snapshot not found, parsing YAML: %s", snapshot_path)
+        return None
+
+    try:
+        snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+        if snapshot.get("version") != PROMPT_SNAPSHOT_VERSION:
+            logger.info("Prompt snapshot version mismatch, parsing YAML: %s", snapshot_path)
+            return None
+        if snapshot.get("source_sha256") != digest:
+            logger.info("Prompt snapshot is stale for %s, parsing YAML.", source_path)
+            return None
+        return _settings_from_snapshot(source_path, snapshot)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Ignoring unreadable prompt snapshot %s: %s", snapshot_path, exc)
+        return None
+
+
+def load_prompt_settings(config_path: Path | None = None) -> PromptSettings:
+    source_path = config_path or _resolve_prompt_config_path()
+    source_bytes = source_path.read_bytes()
+    digest = _source_digest(source_bytes)
+
+    if config_path is None:
+        snapshot_path = _resolve_prompt_snapshot_path()
+    else:
+        # Per-config snapshots are opt-in by building them; a missing one is not worth a log line.
+        snapshot_path = prompt_snapshot_path_for(config_path)
+        if not snapshot_path.exists():
+            snapshot_path = None
+    if snapshot_path is not None:
+        settings = _load_prompt_snapshot(snapshot_path, source_path, digest)
+        if settings is not None:
+            return settings
+
+    return _parse_prompt_settings(source_path, _read_yaml(source_path, source_bytes))
+
+
+def write_prompt_snapshot(
+    snapshot_path: Path | None = None,
+    config_path: Path | None = None,
+) -> Path:
+    if config_path is not None:
+        source_path = _resolve_path(str(config_path))
+        target = snapshot_path or prompt_snapshot_path_for(source_path)
+    else:
+        source_path = _resolve_prompt_config_path()
+        target = snapshot_path or _resolve_prompt_snapshot_path()
+    if target is None:
+        raise ValueError("PROMPT_SNAPSHOT_PATH is not set and no snapshot path was given.")
+
+    source_bytes = source_path.read_bytes()
+    settings = _parse_prompt_settings(source_path, _read_yaml(source_path, source_bytes))
+
+    # Compile guardrail regexes now so a broken pattern never makes it into a snapshot.
+    from app.guardrail import GuardrailEngine
+
+    GuardrailEngine(settings.guardrail)
+
+    snapshot = _settings_to_snapshot(settings, _source_digest(source_bytes))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f"{target.name}.tmp")
+    tmp_path.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(target)
+    return target
+
+
 @lru_cache(maxsize=1)
 def get_prompt_runtime() -> PromptRuntime:
     return PromptRuntime(load_prompt_settings())
 
 
+@lru_cache(maxsize=None)
+def get_prompt_runtime_at(config_path: Path) -> PromptRuntime:
+    return PromptRuntime(load_prompt_settings(_resolve_path(str(config_path))))
+
+
 def reload_prompt_runtime() -> PromptRuntime:
     get_prompt_runtime.cache_clear()
+    get_prompt_runtime_at.cache_clear()
     return get_prompt_runtime()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Write validated prompt config snapshots.")
+    parser.add_argument("output", nargs="?", help="snapshot path (default: PROMPT_SNAPSHOT_PATH)")
+    parser.add_argument("--config", help="prompt config to snapshot instead of the default one")
+    parser.add_argument(
+        "--tenants",
+        action="store_true",
+        help="also write a snapshot next to every tenant prompt_config",
+    )
+    args = parser.parse_args()
+
+    output = Path(args.output).expanduser() if args.output else None
+    config = Path(args.config).expanduser() if args.config else None
+    default_target_set = _resolve_prompt_snapshot_path() is not None
+    if not args.tenants or output is not None or config is not None or default_target_set:
+        written = write_prompt_snapshot(output, config)
+        print(f"Prompt snapshot written: {written}")
+
+    if args.tenants:
+        from app.tenants import get_tenant_registry
+
+        tenant_configs = {
+            tenant.prompt_config_path
+            for tenant in get_tenant_registry().tenants
+            if tenant.prompt_config_path is not None
+        }
+        for tenant_config in sorted(tenant_configs):
+            written = write_prompt_snapshot(config_path=tenant_config)
+            print(f"Prompt snapshot written: {written}")
@@ -0,0 +1,168 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Mapping
+
+from app.prompt_runtime import (
+    PromptRuntime,
+    _read_yaml,
+    _resolve_path,
+    get_prompt_runtime,
+    get_prompt_runtime_at,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TENANT_NAME = "default"
+# Tenant names become URL path segments next to these fixed routes.
+RESERVED_TENANT_NAMES = frozenset({"menu"})
+_TENANT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+_ENV_REFERENCE_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+@dataclass(frozen=True)
+class Tenant:
+    name: str
+    token: str
+    appid: str = ""
+    secret: str = ""
+    original_id: str = ""
+    prompt_profile: str = "wechat"
+    prompt_config_path: Path | None = None
+
+    def prompt_runtime(self) -> PromptRuntime:
+        if self.prompt_config_path is None:
+            return get_prompt_runtime()
+        return get_prompt_runtime_at(self.prompt_config_path)
+
+
+class TenantRegistry:
+    def __init__(self, tenants: list[Tenant], source_path: Path | None = None) -> None:
+        if not tenants:
+            raise ValueError("Tenant registry must contain at least one tenant.")
+        self._tenants = {tenant.name: tenant for tenant in tenants}
+        self._by_original_id = {
+            tenant.original_id: tenant for tenant in tenants if tenant.original_id
+        }
+        self._default = tenants[0]
+        self._source_path = source_path
+
+    @property
+    def source_path(self) -> Path | None:
+        return self._source_path
+
+    @property
+    def default(self) -> Tenant:
+        return self._default
+
+    @property
+    def tenants(self) -> tuple[Tenant, ...]:
+        return tuple(self._tenants.values())
+
+    def get(self, name: str) -> Tenant | None:
+        return self._tenants.get(name)
+
+    def by_original_id(self, original_id: str) -> Tenant | None:
+        return self._by_original_id.get(original_id)
+
+
+def _default_prompt_profile() -> str:
+    return os.getenv("PROMPT_PROFILE", "wechat").strip() or "wechat"
+
+
+def _tenant_from_env() -> Tenant:
+    return Tenant(
+        name=DEFAULT_TENANT_NAME,
+        token=os.getenv("WECHAT_TOKEN", "").strip(),
+        appid=os.getenv("WECHAT_APPID", "").strip(),
+        secret=os.getenv("WECHAT_SECRET", "").strip(),
+        prompt_profile=_default_prompt_profile(),
+    )
+
+
+def _expand_env(value: Any, field_name: str) -> str:
+    text = "" if value is None else str(value)
+
+    def _replace(match: re.Match[str]) -> str:
+        env_name = match.group(1)
+        if env_name not in os.environ:
+            raise ValueError(f"{field_name} references unset environment variable {env_name}.")
+        return os.environ[env_name]
+
+    return _ENV_REFERENCE_PATTERN.sub(_replace, text).strip()
+
+
+def _to_tenant(name: str, raw_tenant: Any) -> Tenant:
+    if not isinstance(raw_tenant, dict):
+        raise ValueError(f"Tenant '{name}' must be a mapping.")
+    if not _TENANT_NAME_PATTERN.match(name):
+        raise ValueError(f"Tenant name '{name}' may only contain letters, digits, '_' and '-'.")
+    if name in RESERVED_TENANT_NAMES:
+        raise ValueError(f"Tenant name '{name}' is reserved.")
+
+    def _field(key: str) -> str:
+        return _expand_env(raw_tenant.get(key), f"tenants.{name}.{key}")
+
+    token = _field("token")
+    if not token:
+        raise ValueError(f"Tenant '{name}' missing token.")
+
+    prompt_config = _field("prompt_config")
+    return Tenant(
+        name=name,
+        token=token,
+        appid=_field("appid"),
+        secret=_field("secret"),
+        original_id=_field("original_id"),
+        prompt_profile=_field("prompt_profile") or _default_prompt_profile(),
+        prompt_config_path=Path(prompt_config) if prompt_config else None,
+    )
+
+
+def _parse_tenants(raw: Mapping[str, Any]) -> list[Tenant]:
+    raw_tenants = raw.get("tenants")
+    if not isinstance(raw_tenants, dict) or not raw_tenants:
+        raise ValueError("Tenant config must include a non-empty 'tenants' mapping.")
+
+    tenants: list[Tenant] = []
+    original_ids: set[str] = set()
+    for tenant_name, raw_tenant in raw_tenants.items():
+        tenant = _to_tenant(str(tenant_name).strip(), raw_tenant)
+        if tenant.original_id:
+            if tenant.original_id in original_ids:
+                raise ValueError(f"Duplicate original_id '{tenant.original_id}' in tenant config.")
+            original_ids.add(tenant.original_id)
+        tenants.append(tenant)
+
+    default_name = str(raw.get("default_tenant", "")).strip()
+    if default_name:
+        default = next((tenant for tenant in tenants if tenant.name == default_name), None)
+        if default is None:
+            raise ValueError(f"default_tenant '{default_name}' is not defined in tenants.")
+        tenants.remove(default)
+        tenants.insert(0, default)
+    return tenants
+
+
+def load_tenant_registry() -> TenantRegistry:
+    from_env = os.getenv("WECHAT_TENANTS_PATH", "").strip()
+    if not from_env:
+        return TenantRegistry([_tenant_from_env()])
+
+    # Same resolution and YAML loader as the prompt config, so both files behave alike.
+    source_path = _resolve_path(from_env)
+    if not source_path.exists():
+        raise FileNotFoundError(f"WECHAT_TENANTS_PATH file not found: {source_path}")
+
+    raw = _read_yaml(source_path, kind="Tenant config")
+    registry = TenantRegistry(_parse_tenants(raw), source_path)
+    logger.info("Loaded %d WeChat tenants from: %s", len(registry.tenants), source_path)
+    return registry
+
+
+@lru_cache(maxsize=1)
+def get_tenant_registry() -> TenantRegistry:
+    return load_tenant_registry()
@@ -0,0 +1,161 @@
+import json
+import os
+import random
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+DEBUG_TRACE_SAMPLE_RATE = float(os.getenv("DEBUG_TRACE_SAMPLE_RATE", "0"))
+DEBUG_TRACE_BUFFER_SIZE = int(os.getenv("DEBUG_TRACE_BUFFER_SIZE", "1000"))
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    start_ms: float
+    duration_ms: float
+    error: str | None = None
+
+
+@dataclass
+class Trace:
+    trace_id: str
+    name: str
+    started_at: float
+    duration_ms: float = 0.0
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    spans: list[SpanRecord] = field(default_factory=list)
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("_start")
+        return data
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("openclaw_trace", default=None)
+_sample_rate = DEBUG_TRACE_SAMPLE_RATE
+_traces: deque[Trace] = deque(maxlen=max(1, DEBUG_TRACE_BUFFER_SIZE))
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+# Returned whenever a request is not sampled, so disabled tracing costs one lookup per call site.
+_NOOP = _NoopScope()
+
+
+class _SpanScope:
+    __slots__ = ("_trace", "_name", "_start")
+
+    def __init__(self, trace: Trace, name: str) -> None:
+        self._trace = trace
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        end = time.perf_counter()
+        self._trace.spans.append(
+            SpanRecord(
+                name=self._name,
+                start_ms=round((self._start - self._trace._start) * 1000, 3),
+                duration_ms=round((end - self._start) * 1000, 3),
+                error=None if exc_type is None else exc_type.__name__,
+            )
+        )
+        return False
+
+
+class _TraceScope:
+    __slots__ = ("_trace", "_token")
+
+    def __init__(self, trace: Trace) -> None:
+        self._trace = trace
+        self._token = None
+
+    def __enter__(self) -> Trace:
+        self._token = _current_trace.set(self._trace)
+        return self._trace
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._trace.duration_ms = round((time.perf_counter() - self._trace._start) * 1000, 3)
+        if exc_type is not None:
+            self._trace.error = exc_type.__name__
+        _current_trace.reset(self._token)
+        _traces.append(self._trace)
+        return False
+
+
+def trace_request(name: str, **attributes: Any):
+    if _sample_rate <= 0 or (_sample_rate < 1 and random.random() >= _sample_rate):
+        return _NOOP
+    trace = Trace(
+        trace_id=uuid.uuid4().hex,
+        name=name,
+        started_at=time.time(),
+        attributes=dict(attributes),
+    )
+    return _TraceScope(trace)
+
+
+def span(name: str):
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _SpanScope(trace, name)
+
+
+def annotate(**attributes: Any) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attributes.update(attributes)
+
+
+def get_sample_rate() -> float:
+    return _sample_rate
+
+
+def set_sample_rate(rate: float) -> None:
+    global _sample_rate
+    if not 0 <= rate <= 1:
+        raise ValueError("Trace sample rate must be between 0 and 1.")
+    _sample_rate = rate
+
+
+def set_buffer_size(size: int) -> None:
+    global _traces
+    if size < 1:
+        raise ValueError("Trace buffer size must be >= 1.")
+    _traces = deque(_traces, maxlen=size)
+
+
+def buffer_size() -> int:
+    return _traces.maxlen or 0
+
+
+def recent_traces() -> list[Trace]:
+    return list(_traces)
+
+
+def clear_traces() -> None:
+    _traces.clear()
+
+
+def export_jsonl() -> str:
+    return "".join(
+        json.dumps(trace.as_dict(), ensure_ascii=False) + "\n" for trace in list(_traces)
+    )
@@ -2,14 +2,15 @@ import asyncio
 import logging
 import os
 
-import httpx
 from fastapi import APIRouter, HTTPException, Request, Response
 from wechatpy import create_reply, parse_message
 from wechatpy.exceptions import InvalidSignatureException
 from wechatpy.utils import check_signature
 
 from app.llm_core import generate_reply
-from app.wechat_token import get_access_token
+from app.tenants import Tenant, get_tenant_registry
+from app.tracing import annotate, span, trace_request
+from app.wechat_api import WeChatAPIError, call_wechat_api
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -26,52 +27,71 @@ WECHAT_SYNC_ERROR_TEXT = os.getenv(
 )
 
 
-def _validate_wechat_signature(signature: str, timestamp: str, nonce: str) -> None:
-    token = os.getenv("WECHAT_TOKEN", "").strip()
-    if not token:
-        raise HTTPException(status_code=500, detail="WECHAT_TOKEN not set")
-
+def _signature_matches(token: str, signature: str, timestamp: str, nonce: str) -> bool:
     try:
         check_signature(token, signature, timestamp, nonce)
-    except InvalidSignatureException as exc:
-        raise HTTPException(status_code=403, detail="Invalid signature") from exc
+    except InvalidSignatureException:
+        return False
+    return True
 
 
-@router.post("/menu")
-async def create_menu():
-    token = await get_access_token()
+def _validate_wechat_signature(tenant: Tenant, signature: str, timestamp: str, nonce: str) -> None:
+    if not tenant.token:
+        raise HTTPException(status_code=500, detail="WECHAT_TOKEN not set")
 
-    menu = {
-        "button": [
-            {"type": "click", "name": "\u5e2e\u52a9", "key": "HELP"},
-            {"type": "click", "name": "\u8bbe\u7f6e", "key": "SETTINGS"},
-        ]
-    }
+    if not _signature_matches(tenant.token, signature, timestamp, nonce):
+        raise HTTPException(status_code=403, detail="Invalid signature")
 
-    url = "https://api.weixin.qq.com/cgi-bin/menu/create"
-    params = {"access_token": token}
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        response = await client.post(url, params=params, json=menu)
-        response.raise_for_status()
-        data = response.json()
+def _tenants_for_signature(signature: str, timestamp: str, nonce: str) -> list[Tenant]:
+    tenants = get_tenant_registry().tenants
+    if not any(tenant.token for tenant in tenants):
+        raise HTTPException(status_code=500, detail="WECHAT_TOKEN not set")
 
-    return data
+    matched = [
+        tenant
+        for tenant in tenants
+        if tenant.token and _signature_matches(tenant.token, signature, timestamp, nonce)
+    ]
+    if not matched:
+        raise HTTPException(status_code=403, detail="Invalid signature")
+    return matched
 
 
-@router.get("")
-async def wechat_verify(signature: str, timestamp: str, nonce: str, echostr: str):
-    _validate_wechat_signature(signature, timestamp, nonce)
-    return Response(content=echostr, media_type="text/plain")
+def _tenant_from_path(tenant_name: str) -> Tenant:
+    tenant = get_tenant_registry().get(tenant_name)
+    if tenant is None:
+        raise HTTPException(status_code=404, detail="Unknown tenant")
+    return tenant
 
 
-@router.post("")
-async def wechat_message(request: Request, signature: str, timestamp: str, nonce: str):
-    _validate_wechat_signature(signature, timestamp, nonce)
+def _tenant_for_target(candidates: list[Tenant], target: str) -> Tenant:
+    # ToUserName picks the account; tenants without original_id act as a catch-all.
+    for tenant in candidates:
+        if tenant.original_id and tenant.original_id == target:
+            return tenant
+    for tenant in candidates:
+        if not tenant.original_id:
+            return tenant
+    raise HTTPException(status_code=403, detail="Message not addressed to a known tenant")
+
+
+async def _create_menu(tenant: Tenant):
+    menu = {
+        "button": [
+            {"type": "click", "name": "\u5e2e\u52a9", "key": "HELP"},
+            {"type": "click", "name": "\u8bbe\u7f6e", "key": "SETTINGS"},
+        ]
+    }
+
+    try:
+        return await call_wechat_api(tenant, "POST", "/cgi-bin/menu/create", json_body=menu)
+    except WeChatAPIError as exc:
+        logger.warning("Create menu failed for tenant %s: %s", tenant.name, exc)
+        return exc.as_dict()
 
-    body = await request.body()
-    msg = parse_message(body)
 
+async def _reply_to_message(tenant: Tenant, msg) -> Response:
     if msg.type != "text":
         return Response(content="success", media_type="text/plain")
 
@@ -79,16 +99,92 @@ async def wechat_message(request: Request, signature: str, timestamp: str, nonce
     from_user = msg.source
 
     try:
-        reply_text = await asyncio.wait_for(
-            generate_reply(user_id=from_user, text=user_text),
-            timeout=DEFAULT_REPLY_TIMEOUT_SECONDS,
-        )
+        with span("generate_reply"):
+            reply_text = await asyncio.wait_for(
+                generate_reply(user_id=from_user, text=user_text, tenant=tenant),
+                timeout=DEFAULT_REPLY_TIMEOUT_SECONDS,
+            )
     except asyncio.TimeoutError:
-        logger.warning("OpenClaw sync reply timeout for user %s", from_user)
+        logger.warning(
+            "OpenClaw sync reply timeout for user %s (tenant %s)", from_user, tenant.name
+        )
         reply_text = WECHAT_SYNC_TIMEOUT_TEXT
     except Exception as exc:
-        logger.warning("Failed to generate OpenClaw sync reply for user %s: %s", from_user, exc)
+        logger.warning(
+            "Failed to generate OpenClaw sync reply for user %s (tenant %s): %s",
+            from_user,
+            tenant.name,
+            exc,
+        )
         reply_text = WECHAT_SYNC_ERROR_TEXT
 
-    reply = create_reply(reply_text, msg)
-    return Response(content=reply.render(), media_type="application/xml")
+    with span("render_reply"):
+        content = create_reply(reply_text, msg).render()
+    return Response(content=content, media_type="application/xml")
+
+
+@router.post("/menu")
+async def create_menu():
+    return await _create_menu(get_tenant_registry().default)
+
+
+@router.get("")
+async def wechat_verify(signature: str, timestamp: str, nonce: str, echostr: str):
+    _tenants_for_signature(signature, timestamp, nonce)
+    return Response(content=echostr, media_type="text/plain")
+
+
+@router.post("")
+async def wechat_message(request: Request, signature: str, timestamp: str, nonce: str):
+    with trace_request("wechat_message"):
+        with span("check_signature"):
+            candidates = _tenants_for_signature(signature, timestamp, nonce)
+
+        body = await request.body()
+        with span("parse_message"):
+            msg = parse_message(body)
+
+        tenant = _tenant_for_target(candidates, msg.target)
+        annotate(tenant=tenant.name, msg_type=msg.type)
+        return await _reply_to_message(tenant, msg)
+
+
+@router.post("/{tenant_name}/menu")
+async def create_tenant_menu(tenant_name: str):
+    return await _create_menu(_tenant_from_path(tenant_name))
+
+
+@router.get("/{tenant_name}")
+async def wechat_tenant_verify(
+    tenant_name: str,
+    signature: str,
+    timestamp: str,
+    nonce: str,
+    echostr: str,
+):
+    tenant = _tenant_from_path(tenant_name)
+    _validate_wechat_signature(tenant, signature, timestamp, nonce)
+    return Response(content=echostr, media_type="text/plain")
+
+
+@router.post("/{tenant_name}")
+async def wechat_tenant_message(
+    request: Request,
+    tenant_name: str,
+    signature: str,
+    timestamp: str,
+    nonce: str,
+):
+    with trace_request("wechat_message", tenant=tenant_name):
+        tenant = _tenant_from_path(tenant_name)
+        with span("check_signature"):
+            _validate_wechat_signature(tenant, signature, timestamp, nonce)
+
+        body = await request.body()
+        with span("parse_message"):
+            msg = parse_message(body)
+
+        if tenant.original_id and msg.target != tenant.original_id:
+            raise HTTPException(status_code=403, detail="Message not addressed to this tenant")
+        annotate(msg_type=msg.type)
+        return await _reply_to_message(tenant, msg)
@@ -0,0 +1,215 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Mapping
+
+import httpx
+
+from app.http_pool import get_http_client
+from app.tenants import Tenant
+
+logger = logging.getLogger(__name__)
+
+WECHAT_API_BASE_URL = os.getenv("WECHAT_API_BASE_URL", "https://api.weixin.qq.com").rstrip("/")
+WECHAT_API_TIMEOUT_SECONDS = float(os.getenv("WECHAT_API_TIMEOUT_SECONDS", "20"))
+WECHAT_API_MAX_CONCURRENCY = int(os.getenv("WECHAT_API_MAX_CONCURRENCY", "8"))
+WECHAT_API_RATE_PER_SECOND = float(os.getenv("WECHAT_API_RATE_PER_SECOND", "20"))
+WECHAT_API_RATE_BURST = int(os.getenv("WECHAT_API_RATE_BURST", "20"))
+WECHAT_API_MAX_RETRIES = int(os.getenv("WECHAT_API_MAX_RETRIES", "3"))
+WECHAT_API_RETRY_BASE_SECONDS = float(os.getenv("WECHAT_API_RETRY_BASE_SECONDS", "0.5"))
+WECHAT_API_QUOTA_COOLDOWN_SECONDS = float(os.getenv("WECHAT_API_QUOTA_COOLDOWN_SECONDS", "600"))
+
+# access_token invalid / invalid credential / access_token expired
+TOKEN_ERRCODES = frozenset({40001, 40014, 42001})
+# system busy / API called too frequently: worth retrying after a pause
+THROTTLE_ERRCODES = frozenset({-1, 45011})
+# daily API quota reached: retrying only burns requests until WeChat resets the quota
+QUOTA_ERRCODES = frozenset({45009})
+
+# Raised before the request reached WeChat, so retrying cannot duplicate a side effect.
+_RETRYABLE_TRANSPORT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class WeChatAPIError(RuntimeError):
+    def __init__(self, errcode: int, errmsg: str, path: str) -> None:
+        super().__init__(f"WeChat API {path} failed: errcode={errcode} errmsg={errmsg}")
+        self.errcode = errcode
+        self.errmsg = errmsg
+        self.path = path
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"errcode": self.errcode, "errmsg": self.errmsg}
+
+
+class _RateLimiter:
+    def __init__(self, rate_per_second: float, burst: int) -> None:
+        self._rate = rate_per_second
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        if self._rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+_rate_limiters: dict[str, _RateLimiter] = {}
+# WeChat counts daily quotas per API, so a 45009 only blocks that (account, path) pair.
+_quota_exhausted_until: dict[tuple[str, str], float] = {}
+_concurrency: asyncio.Semaphore | None = None
+
+
+def _rate_limiter_for(rate_key: str) -> _RateLimiter:
+    limiter = _rate_limiters.get(rate_key)
+    if limiter is None:
+        limiter = _RateLimiter(WECHAT_API_RATE_PER_SECOND, WECHAT_API_RATE_BURST)
+        _rate_limiters[rate_key] = limiter
+    return limiter
+
+
+def _concurrency_limit() -> asyncio.Semaphore:
+    global _concurrency
+    if _concurrency is None:
+        _concurrency = asyncio.Semaphore(max(1, WECHAT_API_MAX_CONCURRENCY))
+    return _concurrency
+
+
+def _backoff_seconds(attempt: int) -> float:
+    delay = WECHAT_API_RETRY_BASE_SECONDS * (2**attempt)
+    return delay + random.uniform(0, delay / 2)
+
+
+def _check_quota(rate_key: str, path: str) -> None:
+    blocked_until = _quota_exhausted_until.get((rate_key, path), 0.0)
+    if time.monotonic() < blocked_until:
+        raise WeChatAPIError(45009, "api daily quota reached (local cooldown)", path)
+
+
+async def request_wechat_api(
+    method: str,
+    path: str,
+    *,
+    rate_key: str,
+    params: Mapping[str, Any] | None = None,
+    json_body: Any = None,
+) -> dict[str, Any]:
+    _check_quota(rate_key, path)
+    limiter = _rate_limiter_for(rate_key)
+    url = f"{WECHAT_API_BASE_URL}{path}"
+    content = None
+    headers = None
+    if json_body is not None:
+        # WeChat shows \uXXXX escapes literally (e.g. in menu names), so send raw UTF-8.
+        content = json.dumps(json_body, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        async with _concurrency_limit():
+            try:
+                response = await get_http_client("wechat").request(
+                    method,
+                    url,
+                    params=params,
+                    content=content,
+                    headers=headers,
+                    timeout=WECHAT_API_TIMEOUT_SECONDS,
+                )
+            except _RETRYABLE_TRANSPORT_ERRORS as exc:
+                if attempt >= WECHAT_API_MAX_RETRIES:
+                    raise
+                delay = _backoff_seconds(attempt)
+                logger.warning("WeChat API %s unreachable (%s), retrying in %.2fs", path, exc, delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+        response.raise_for_status()
+        data = response.json()
+        errcode = int(data.get("errcode") or 0)
+        if errcode == 0:
+            return data
+
+        error = WeChatAPIError(errcode, str(data.get("errmsg", "")), path)
+        if errcode in QUOTA_ERRCODES:
+            _quota_exhausted_until[(rate_key, path)] = (
+                time.monotonic() + WECHAT_API_QUOTA_COOLDOWN_SECONDS
+            )
+            logger.warning(
+                "WeChat API %s quota reached for %s; pausing calls for %.0fs",
+                path,
+                rate_key,
+                WECHAT_API_QUOTA_COOLDOWN_SECONDS,
+            )
+            raise error
+        if errcode not in THROTTLE_ERRCODES or attempt >= WECHAT_API_MAX_RETRIES:
+            raise error
+
+        delay = _backoff_seconds(attempt)
+        # Slow down every caller sharing this account, not just the one that got throttled.
+        limiter.pause(delay)
+        logger.warning(
+            "WeChat API %s throttled (errcode=%s), retrying in %.2fs", path, errcode, delay
+        )
+        attempt += 1
+
+
+async def call_wechat_api(
+    tenant: Tenant,
+    method: str,
+    path: str,
+    *,
+    params: Mapping[str, Any] | None = None,
+    json_body: Any = None,
+) -> dict[str, Any]:
+    # Imported here: wechat_token fetches tokens through request_wechat_api above.
+    from app.wechat_token import get_access_token, invalidate_access_token
+
+    token = await get_access_token(tenant)
+    try:
+        return await request_wechat_api(
+            method,
+            path,
+            rate_key=tenant.appid,
+            params={**(params or {}), "access_token": token},
+            json_body=json_body,
+        )
+    except WeChatAPIError as exc:
+        if exc.errcode not in TOKEN_ERRCODES:
+            raise
+        logger.info(
+            "WeChat access token rejected for tenant %s (errcode=%s), refreshing",
+            tenant.name,
+            exc.errcode,
+        )
+        invalidate_access_token(tenant, token)
+
+    token = await get_access_token(tenant)
+    return await request_wechat_api(
+        method,
+        path,
+        rate_key=tenant.appid,
+        params={**(params or {}), "access_token": token},
+        json_body=json_body,
+    )
@@ -1,39 +1,56 @@
-import os
+import asyncio
 import time
 
-import httpx
+from app.tenants import Tenant, get_tenant_registry
+from app.wechat_api import request_wechat_api
 
-_token = None
-_expire_at = 0
+# Access tokens are per official account, so the cache is keyed by appid.
+_tokens: dict[str, tuple[str, int]] = {}
+_refresh_locks: dict[str, asyncio.Lock] = {}
 
 
-def _get_wechat_credentials() -> tuple[str, str]:
-    appid = os.getenv("WECHAT_APPID", "").strip()
-    secret = os.getenv("WECHAT_SECRET", "").strip()
-    if not appid or not secret:
-        raise RuntimeError("WECHAT_APPID or WECHAT_SECRET is not set")
-    return appid, secret
+def _get_wechat_credentials(tenant: Tenant) -> tuple[str, str]:
+    if not tenant.appid or not tenant.secret:
+        raise RuntimeError(f"WECHAT_APPID or WECHAT_SECRET is not set for tenant '{tenant.name}'")
+    return tenant.appid, tenant.secret
 
 
-async def get_access_token() -> str:
-    global _token, _expire_at
+def _cached_token(appid: str) -> str | None:
+    cached = _tokens.get(appid)
+    if cached and int(time.time()) < cached[1] - 120:
+        return cached[0]
+    return None
 
-    now = int(time.time())
-    if _token and now < _expire_at - 120:
-        return _token
 
-    appid, secret = _get_wechat_credentials()
-    url = "https://api.weixin.qq.com/cgi-bin/token"
-    params = {"grant_type": "client_credential", "appid": appid, "secret": secret}
+def invalidate_access_token(tenant: Tenant, token: str) -> None:
+    # Only drop the token that was rejected; a concurrent caller may already have refreshed it.
+    cached = _tokens.get(tenant.appid)
+    if cached and cached[0] == token:
+        _tokens.pop(tenant.appid, None)
 
-    async with httpx.AsyncClient(timeout=20) as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
 
-    if "access_token" not in data:
-        raise RuntimeError(f"get_access_token failed: {data}")
+async def get_access_token(tenant: Tenant | None = None) -> str:
+    tenant = tenant or get_tenant_registry().default
+    appid, secret = _get_wechat_credentials(tenant)
 
-    _token = data["access_token"]
-    _expire_at = now + int(data.get("expires_in", 7200))
-    return _token
+    token = _cached_token(appid)
+    if token:
+        return token
+
+    # One refresh per account at a time; waiters reuse the token it fetched.
+    lock = _refresh_locks.setdefault(appid, asyncio.Lock())
+    async with lock:
+        token = _cached_token(appid)
+        if token:
+            return token
+
+        now = int(time.time())
+        params = {"grant_type": "client_credential", "appid": appid, "secret": secret}
+        data = await request_wechat_api("GET", "/cgi-bin/token", rate_key=appid, params=params)
+
+        if "access_token" not in data:
+            raise RuntimeError(f"get_access_token failed: {data}")
+
+        token = data["access_token"]
+        _tokens[appid] = (token, now + int(data.get("expires_in", 7200)))
+        return token
@@ -0,0 +1,100 @@
+"""Cold-start benchmark for the gateway.
+
+Each scenario runs in a fresh interpreter so import caches do not leak between samples.
+
+    python benchmarks/startup_benchmark.py --runs 7
+
+Scenarios:
+- import_app: time to import ``app.main`` (FastAPI, wechatpy, routers).
+- settings_yaml: validate the prompt config from YAML.
+- settings_snapshot: load the same config from a matching ``PROMPT_SNAPSHOT_PATH`` snapshot.
+- startup: import + startup hook until the app accepts requests (warmup runs in background).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCENARIOS = ("import_app", "settings_yaml", "settings_snapshot", "startup")
+
+
+def _child(scenario: str) -> float:
+    sys.path.insert(0, str(REPO_ROOT))
+    start = time.perf_counter()
+
+    if scenario == "import_app":
+        import app.main  # noqa: F401
+    elif scenario in {"settings_yaml", "settings_snapshot"}:
+        from app.prompt_runtime import load_prompt_settings
+
+        load_prompt_settings()
+    elif scenario == "startup":
+        from fastapi.testclient import TestClient
+
+        from app.main import app
+
+        with TestClient(app) as client:
+            client.get("/health")
+    else:
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+    return (time.perf_counter() - start) * 1000
+
+
+def _run_scenario(scenario: str, runs: int, env: dict[str, str]) -> list[float]:
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, __file__, "--child", scenario],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(float(completed.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=SCENARIOS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(f"{_child(args.child):.3f}")
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        base_env = dict(os.environ)
+        # Point warmup at a closed port so the benchmark never depends on a live Ollama.
+        base_env.setdefault("OLLAMA_BASE_URL", "http://127.0.0.1:9")
+        base_env.pop("PROMPT_SNAPSHOT_PATH", None)
+
+        snapshot_env = dict(base_env)
+        snapshot_env["PROMPT_SNAPSHOT_PATH"] = str(Path(tmpdir) / "prompt.snapshot.json")
+        subprocess.run(
+            [sys.executable, "-m", "app.prompt_runtime"],
+            cwd=REPO_ROOT,
+            env=snapshot_env,
+            capture_output=True,
+            check=True,
+        )
+
+        print(f"{'scenario':<20}{'median ms':>12}{'min ms':>12}{'max ms':>12}")
+        for scenario in SCENARIOS:
+            env = snapshot_env if scenario in {"settings_snapshot", "startup"} else base_env
+            samples = _run_scenario(scenario, args.runs, env)
+            print(
+                f"{scenario:<20}{statistics.median(samples):>12.1f}"
+                f"{min(samples):>12.1f}{max(samples):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import json
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+import httpx
+
+from app.keep_warm import KeepWarmScheduler, parse_keep_alive_seconds
+
+BACKEND = "http://ollama.test"
+MODEL = "qwen2.5:7b"
+
+
+def _expires_in(seconds: float) -> str:
+    return datetime.fromtimestamp(time.time() + seconds, tz=timezone.utc).isoformat()
+
+
+class FakeOllama:
+    def __init__(self) -> None:
+        self.loaded: dict[str, str] = {}
+        self.reachable = True
+        self.generate_calls: list[dict] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if not self.reachable:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/api/ps":
+            models = [{"name": name, "expires_at": expires} for name, expires in self.loaded.items()]
+            return httpx.Response(200, json={"models": models})
+        if request.url.path == "/api/generate":
+            self.generate_calls.append(json.loads(request.content))
+            self.loaded[MODEL] = _expires_in(1800)
+            return httpx.Response(200, json={"response": "", "done": True})
+        return httpx.Response(404)
+
+
+class ParseKeepAliveTests(unittest.TestCase):
+    def test_parses_ollama_duration_forms(self) -> None:
+        self.assertEqual(parse_keep_alive_seconds("30m"), 1800)
+        self.assertEqual(parse_keep_alive_seconds("1h30m"), 5400)
+        self.assertEqual(parse_keep_alive_seconds("300"), 300)
+        self.assertEqual(parse_keep_alive_seconds(""), 300)
+        self.assertIsNone(parse_keep_alive_seconds("-1"))
+
+    def test_invalid_duration_raises(self) -> None:
+        with self.assertRaises(ValueError):
+            parse_keep_alive_seconds("soon")
+
+
+class KeepWarmSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.ollama = FakeOllama()
+        self.scheduler = KeepWarmScheduler(
+            [(BACKEND, MODEL)],
+            keep_alive_seconds=1800,
+            interval_seconds=60,
+            margin_seconds=120,
+            transport=httpx.MockTransport(self.ollama.handler),
+        )
+
+    async def test_cold_model_is_warmed(self) -> None:
+        await self.scheduler.check_once()
+
+        self.assertEqual(len(self.ollama.generate_calls), 1)
+        self.assertEqual(self.ollama.generate_calls[0]["prompt"], "")
+        self.assertEqual(self.scheduler.status()[0]["state"], "warm")
+        self.assertEqual(self.scheduler.cold_models(), [])
+
+    async def test_warm_model_is_left_alone(self) -> None:
+        self.ollama.loaded[MODEL] = _expires_in(1500)
+
+        await self.scheduler.check_once()
+
+        self.assertEqual(self.ollama.generate_calls, [])
+        self.assertEqual(self.scheduler.status()[0]["state"], "warm")
+
+    async def test_expiring_model_gets_keep_alive(self) -> None:
+        self.ollama.loaded[MODEL] = _expires_in(30)
+
+        await self.scheduler.check_once()
+
+        self.assertEqual(len(self.ollama.generate_calls), 1)
+
+    async def test_backend_restart_reports_cold_then_rewarms(self) -> None:
+        self.ollama.loaded[MODEL] = _expires_in(1500)
+        self.ollama.reachable = False
+
+        await self.scheduler.check_once()
+        self.assertEqual(self.scheduler.cold_models(), [MODEL])
+
+        self.ollama.reachable = True
+        await self.scheduler.check_once()
+
+        self.assertEqual(len(self.ollama.generate_calls), 1)
+        self.assertEqual(self.scheduler.cold_models(), [])
+
+    async def test_unused_model_is_not_loaded_when_warm_unused_is_off(self) -> None:
+        scheduler = KeepWarmScheduler(
+            [(BACKEND, MODEL)],
+            keep_alive_seconds=1800,
+            warm_unused=False,
+            transport=httpx.MockTransport(self.ollama.handler),
+        )
+
+        await scheduler.check_once()
+
+        self.assertEqual(self.ollama.generate_calls, [])
+        self.assertEqual(scheduler.cold_models(), [MODEL])
+
+    async def test_previously_warm_model_is_rewarmed_when_warm_unused_is_off(self) -> None:
+        scheduler = KeepWarmScheduler(
+            [(BACKEND, MODEL)],
+            keep_alive_seconds=1800,
+            warm_unused=False,
+            transport=httpx.MockTransport(self.ollama.handler),
+        )
+        self.ollama.loaded[MODEL] = _expires_in(1500)
+        await scheduler.check_once()
+
+        self.ollama.loaded.clear()
+        await scheduler.check_once()
+
+        self.assertEqual(len(self.ollama.generate_calls), 1)
+        self.assertEqual(scheduler.cold_models(), [])
+
+    async def test_model_that_served_traffic_is_rewarmed_when_warm_unused_is_off(self) -> None:
+        scheduler = KeepWarmScheduler(
+            [(BACKEND, MODEL)],
+            keep_alive_seconds=1800,
+            warm_unused=False,
+            transport=httpx.MockTransport(self.ollama.handler),
+        )
+
+        with mock.patch("app.keep_warm.model_last_used", return_value=time.monotonic()):
+            await scheduler.check_once()
+
+        self.assertEqual(len(self.ollama.generate_calls), 1)
+
+    async def test_user_traffic_takes_priority(self) -> None:
+        with mock.patch("app.keep_warm.user_requests_in_flight", return_value=1):
+            await self.scheduler.check_once()
+
+        self.assertEqual(self.ollama.generate_calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
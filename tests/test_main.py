@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def _controlled_warmup(release: threading.Event, result: bool):
+    async def warmup_ollama() -> bool:
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return result
+
+    return warmup_ollama
+
+
+class StubKeepWarmScheduler:
+    def __init__(self, state: str) -> None:
+        self.state = state
+
+    async def run(self, after=None) -> None:
+        return None
+
+    def model_state(self, model: str) -> str:
+        return self.state
+
+    def status(self) -> list[dict[str, object]]:
+        return [{"model": "m", "state": self.state}]
+
+    def cold_models(self) -> list[str]:
+        return ["m"] if self.state == "cold" else []
+
+
+class ReadyEndpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._patches = [
+            mock.patch("app.main.keep_warm_enabled", return_value=False),
+            mock.patch("app.main.OLLAMA_WARMUP_ON_STARTUP", True),
+        ]
+        for patch in self._patches:
+            patch.start()
+
+    def tearDown(self) -> None:
+        for patch in reversed(self._patches):
+            patch.stop()
+
+    def _ready_after_release(self, result: bool) -> tuple[object, object]:
+        release = threading.Event()
+        with mock.patch("app.main.warmup_ollama", _controlled_warmup(release, result)):
+            with TestClient(app) as client:
+                pending = client.get("/ready")
+                release.set()
+                done = self._wait_until_settled(client)
+        return pending, done
+
+    @staticmethod
+    def _wait_until_settled(client: TestClient):
+        deadline = time.monotonic() + 2
+        while True:
+            response = client.get("/ready")
+            if response.json()["warmup"] != "pending" or time.monotonic() > deadline:
+                return response
+            time.sleep(0.01)
+
+    def test_pending_then_ok(self) -> None:
+        pending, done = self._ready_after_release(True)
+
+        self.assertEqual(pending.status_code, 503)
+        self.assertEqual(pending.json(), {"ready": False, "warmup": "pending"})
+        self.assertEqual(done.status_code, 200)
+        self.assertEqual(done.json(), {"ready": True, "warmup": "ok"})
+
+    def test_pending_then_failed(self) -> None:
+        pending, done = self._ready_after_release(False)
+
+        self.assertEqual(pending.status_code, 503)
+        self.assertEqual(done.status_code, 503)
+        self.assertEqual(done.json(), {"ready": False, "warmup": "failed"})
+
+    def test_disabled_warmup_is_ready(self) -> None:
+        with mock.patch("app.main.OLLAMA_WARMUP_ON_STARTUP", False):
+            with mock.patch("app.main.warmup_ollama", mock.AsyncMock(return_value=False)):
+                with TestClient(app) as client:
+                    response = client.get("/ready")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"ready": True, "warmup": "disabled"})
+
+
+    def _ready_with_keep_warm(self, warmup_result: bool, state: str):
+        scheduler = StubKeepWarmScheduler(state)
+        with mock.patch("app.main.keep_warm_enabled", return_value=True):
+            with mock.patch("app.main.get_keep_warm_scheduler", return_value=scheduler):
+                pending, done = self._ready_after_release(warmup_result)
+        self.assertEqual(pending.status_code, 503)
+        return done
+
+    def test_keep_warm_cold_model_is_not_ready(self) -> None:
+        done = self._ready_with_keep_warm(True, "cold")
+
+        self.assertEqual(done.status_code, 503)
+        self.assertEqual(done.json()["cold_models"], ["m"])
+
+    def test_keep_warm_warm_model_is_ready(self) -> None:
+        done = self._ready_with_keep_warm(True, "warm")
+
+        self.assertEqual(done.status_code, 200)
+        self.assertTrue(done.json()["ready"])
+
+    def test_keep_warm_recovers_after_failed_warmup(self) -> None:
+        done = self._ready_with_keep_warm(False, "warm")
+
+        self.assertEqual(done.status_code, 200)
+        self.assertEqual(done.json()["warmup"], "failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,40 @@
+import json
 import os
 import tempfile
 import textwrap
 import unittest
 from pathlib import Path
 
-from app.prompt_runtime import get_prompt_runtime, reload_prompt_runtime
+from app.prompt_runtime import (
+    get_prompt_runtime,
+    get_prompt_runtime_at,
+    prompt_snapshot_path_for,
+    reload_prompt_runtime,
+    write_prompt_snapshot,
+)
+
+SNAPSHOT_TEST_CONFIG = textwrap.dedent(
+    """
+    default_profile: wechat
+    profiles:
+      wechat:
+        system_prompt: |
+          YAML_SYSTEM
+        user_prompt_template: |
+          MESSAGE={user_text}
+    guardrail:
+      enabled: true
+      blocked_input_patterns:
+        - "(?i)forbidden"
+    """
+).strip()
 
 
 class PromptRuntimeTests(unittest.TestCase):
     def setUp(self) -> None:
         self._original_prompt_path = os.environ.get("PROMPT_CONFIG_PATH")
         self._original_example_path = os.environ.get("PROMPT_EXAMPLE_PATH")
+        self._original_snapshot_path = os.environ.get("PROMPT_SNAPSHOT_PATH")
 
     def tearDown(self) -> None:
         if self._original_prompt_path is None:
@@ -23,7 +47,13 @@ class PromptRuntimeTests(unittest.TestCase):
         else:
             os.environ["PROMPT_EXAMPLE_PATH"] = self._original_example_path
 
+        if self._original_snapshot_path is None:
+            os.environ.pop("PROMPT_SNAPSHOT_PATH", None)
+        else:
+            os.environ["PROMPT_SNAPSHOT_PATH"] = self._original_snapshot_path
+
         get_prompt_runtime.cache_clear()
+        get_prompt_runtime_at.cache_clear()
 
     def test_load_runtime_from_env_path(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -93,6 +123,66 @@ class PromptRuntimeTests(unittest.TestCase):
             self.assertIn("A=", rendered)
             self.assertIn("B=x", rendered)
 
+    def test_matching_snapshot_is_used_instead_of_yaml(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cfg = Path(tmpdir) / "prompt.private.yaml"
+            cfg.write_text(SNAPSHOT_TEST_CONFIG + "\n", encoding="utf-8")
+            snapshot_path = Path(tmpdir) / "prompt.snapshot.json"
+
+            os.environ["PROMPT_CONFIG_PATH"] = str(cfg)
+            os.environ["PROMPT_SNAPSHOT_PATH"] = str(snapshot_path)
+            write_prompt_snapshot()
+
+            snapshot = json.loads(snapshot_path.read_text(encoding="utf-8"))
+            snapshot["profiles"]["wechat"]["system_prompt"] = "SNAPSHOT_SYSTEM"
+            snapshot_path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+            runtime = reload_prompt_runtime()
+
+            self.assertEqual(runtime.system_prompt("wechat"), "SNAPSHOT_SYSTEM")
+            self.assertEqual(runtime.source_path, cfg)
+            self.assertEqual(
+                runtime.guardrail_settings.blocked_input_patterns,
+                ("(?i)forbidden",),
+            )
+
+    def test_stale_snapshot_falls_back_to_yaml(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cfg = Path(tmpdir) / "prompt.private.yaml"
+            cfg.write_text(SNAPSHOT_TEST_CONFIG + "\n", encoding="utf-8")
+            snapshot_path = Path(tmpdir) / "prompt.snapshot.json"
+
+            os.environ["PROMPT_CONFIG_PATH"] = str(cfg)
+            os.environ["PROMPT_SNAPSHOT_PATH"] = str(snapshot_path)
+            write_prompt_snapshot()
+
+            cfg.write_text(
+                SNAPSHOT_TEST_CONFIG.replace("YAML_SYSTEM", "UPDATED_SYSTEM") + "\n",
+                encoding="utf-8",
+            )
+            runtime = reload_prompt_runtime()
+
+            self.assertEqual(runtime.system_prompt("wechat"), "UPDATED_SYSTEM")
+
+    def test_tenant_config_uses_its_own_snapshot(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cfg = Path(tmpdir) / "prompt.brand_b.private.yaml"
+            cfg.write_text(SNAPSHOT_TEST_CONFIG + "\n", encoding="utf-8")
+            os.environ["PROMPT_SNAPSHOT_PATH"] = str(Path(tmpdir) / "prompt.snapshot.json")
+
+            written = write_prompt_snapshot(config_path=cfg)
+            self.assertEqual(written, Path(tmpdir) / "prompt.brand_b.private.snapshot.json")
+            self.assertEqual(prompt_snapshot_path_for(cfg), written)
+
+            snapshot = json.loads(written.read_text(encoding="utf-8"))
+            snapshot["profiles"]["wechat"]["system_prompt"] = "TENANT_SNAPSHOT_SYSTEM"
+            written.write_text(json.dumps(snapshot), encoding="utf-8")
+
+            with self.assertNoLogs("app.prompt_runtime", level="INFO"):
+                runtime = get_prompt_runtime_at(cfg)
+
+            self.assertEqual(runtime.system_prompt("wechat"), "TENANT_SNAPSHOT_SYSTEM")
+
     def test_load_runtime_from_local_private_config(self) -> None:
         if os.environ.get("RUN_PRIVATE_PROMPT_TEST") != "1":
             self.skipTest("Set RUN_PRIVATE_PROMPT_TEST=1 to enable local private prompt test.")
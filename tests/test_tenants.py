@@ -0,0 +1,120 @@
+import hashlib
+import os
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.tenants import get_tenant_registry, load_tenant_registry
+
+TENANTS_CONFIG = textwrap.dedent(
+    """
+    default_tenant: brand_b
+    tenants:
+      brand_a:
+        original_id: gh_a
+        token: ${TEST_BRAND_A_TOKEN}
+        prompt_profile: wechat
+      brand_b:
+        original_id: gh_b
+        token: token-b
+        appid: appid-b
+        secret: secret-b
+        prompt_profile: default
+    """
+).strip()
+
+MESSAGE_XML = """<xml>
+<ToUserName><![CDATA[{to}]]></ToUserName>
+<FromUserName><![CDATA[user-1]]></FromUserName>
+<CreateTime>1700000000</CreateTime>
+<MsgType><![CDATA[text]]></MsgType>
+<Content><![CDATA[hello]]></Content>
+<MsgId>1</MsgId>
+</xml>"""
+
+
+def _signed_params(token: str) -> dict[str, str]:
+    timestamp, nonce = "1700000000", "nonce"
+    signature = hashlib.sha1("".join(sorted([token, timestamp, nonce])).encode()).hexdigest()
+    return {"signature": signature, "timestamp": timestamp, "nonce": nonce}
+
+
+class TenantRegistryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._config_path = Path(self._tmpdir.name) / "tenants.private.yaml"
+        self._config_path.write_text(TENANTS_CONFIG + "\n", encoding="utf-8")
+        self._env = mock.patch.dict(
+            os.environ,
+            {"WECHAT_TENANTS_PATH": str(self._config_path), "TEST_BRAND_A_TOKEN": "token-a"},
+        )
+        self._env.start()
+        get_tenant_registry.cache_clear()
+
+    def tearDown(self) -> None:
+        self._env.stop()
+        get_tenant_registry.cache_clear()
+        self._tmpdir.cleanup()
+
+    def test_load_registry_with_env_references(self) -> None:
+        registry = load_tenant_registry()
+
+        self.assertEqual(registry.default.name, "brand_b")
+        self.assertEqual(registry.get("brand_a").token, "token-a")
+        self.assertEqual(registry.by_original_id("gh_b").appid, "appid-b")
+
+    def test_unset_env_reference_raises(self) -> None:
+        del os.environ["TEST_BRAND_A_TOKEN"]
+
+        with self.assertRaises(ValueError):
+            load_tenant_registry()
+
+    def test_reserved_tenant_name_raises(self) -> None:
+        self._config_path.write_text(
+            "tenants:\n  menu:\n    token: t\n",
+            encoding="utf-8",
+        )
+
+        with self.assertRaises(ValueError):
+            load_tenant_registry()
+
+    def test_without_tenant_config_uses_single_env_tenant(self) -> None:
+        with mock.patch.dict(os.environ, {"WECHAT_TENANTS_PATH": "", "WECHAT_TOKEN": "env-token"}):
+            registry = load_tenant_registry()
+
+        self.assertEqual(len(registry.tenants), 1)
+        self.assertEqual(registry.default.token, "env-token")
+
+    def test_message_routed_by_to_user_name(self) -> None:
+        client = TestClient(app)
+        generate_reply = mock.AsyncMock(return_value="reply")
+
+        with mock.patch("app.wechat.generate_reply", generate_reply):
+            response = client.post(
+                "/wechat",
+                params=_signed_params("token-a"),
+                content=MESSAGE_XML.format(to="gh_a"),
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(generate_reply.await_args.kwargs["tenant"].name, "brand_a")
+
+    def test_path_route_rejects_other_tenant_signature(self) -> None:
+        client = TestClient(app)
+
+        response = client.post(
+            "/wechat/brand_b",
+            params=_signed_params("token-a"),
+            content=MESSAGE_XML.format(to="gh_b"),
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
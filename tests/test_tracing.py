@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from app import tracing
+from app.debug import LoopLagMonitor, sample_stacks
+from app.main import app
+
+
+class TracingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original_rate = tracing.get_sample_rate()
+        self._original_size = tracing.buffer_size()
+        tracing.clear_traces()
+
+    def tearDown(self) -> None:
+        tracing.set_sample_rate(self._original_rate)
+        tracing.set_buffer_size(self._original_size)
+        tracing.clear_traces()
+
+    def test_disabled_tracing_records_nothing(self) -> None:
+        tracing.set_sample_rate(0)
+
+        with tracing.trace_request("wechat_message") as trace:
+            with tracing.span("ollama_chat"):
+                pass
+
+        self.assertIsNone(trace)
+        self.assertEqual(tracing.recent_traces(), [])
+
+    def test_sampled_trace_records_spans_and_errors(self) -> None:
+        tracing.set_sample_rate(1)
+
+        with tracing.trace_request("wechat_message", tenant="a"):
+            with tracing.span("guardrail.check_input"):
+                pass
+            with self.assertRaises(TimeoutError):
+                with tracing.span("ollama_chat"):
+                    raise TimeoutError()
+
+        (trace,) = tracing.recent_traces()
+        self.assertEqual(trace.attributes, {"tenant": "a"})
+        self.assertEqual([s.name for s in trace.spans], ["guardrail.check_input", "ollama_chat"])
+        self.assertEqual(trace.spans[1].error, "TimeoutError")
+
+        exported = [json.loads(line) for line in tracing.export_jsonl().splitlines()]
+        self.assertEqual(exported[0]["trace_id"], trace.trace_id)
+
+    def test_ring_buffer_is_bounded(self) -> None:
+        tracing.set_sample_rate(1)
+        tracing.set_buffer_size(2)
+
+        for index in range(5):
+            with tracing.trace_request("wechat_message", index=index):
+                pass
+
+        self.assertEqual([t.attributes["index"] for t in tracing.recent_traces()], [3, 4])
+
+
+class DebugSurfaceTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original_rate = tracing.get_sample_rate()
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        tracing.set_sample_rate(self._original_rate)
+
+    def test_debug_routes_hidden_without_admin_token(self) -> None:
+        with mock.patch.dict(os.environ, {"ADMIN_TOKEN": ""}):
+            response = self.client.get("/debug/status")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_debug_routes_require_matching_admin_token(self) -> None:
+        with mock.patch.dict(os.environ, {"ADMIN_TOKEN": "secret"}):
+            denied = self.client.get("/debug/status", headers={"X-Admin-Token": "wrong"})
+            updated = self.client.post(
+                "/debug/tracing",
+                json={"sample_rate": 0.5},
+                headers={"X-Admin-Token": "secret"},
+            )
+
+        self.assertEqual(denied.status_code, 403)
+        self.assertEqual(updated.status_code, 200)
+        self.assertEqual(updated.json()["tracing"]["sample_rate"], 0.5)
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_sample_stacks_sees_busy_thread(self) -> None:
+        stop = threading.Event()
+
+        def busy_loop() -> None:
+            while not stop.is_set():
+                pass
+
+        worker = threading.Thread(target=busy_loop)
+        worker.start()
+        try:
+            stacks = sample_stacks(0.1, 0.005, worker.ident)
+        finally:
+            stop.set()
+            worker.join()
+
+        self.assertTrue(any("busy_loop" in stack for stack in stacks))
+
+    def test_loop_lag_monitor_counts_stalls(self) -> None:
+        monitor = LoopLagMonitor(interval_seconds=0.1, threshold_ms=50)
+
+        with self.assertLogs("app.debug", level="WARNING"):
+            monitor.record(10)
+            monitor.record(120)
+
+        status = monitor.status()
+        self.assertEqual(status["samples"], 2)
+        self.assertEqual(status["stalls"], 1)
+        self.assertEqual(status["max_lag_ms"], 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+from fastapi import FastAPI, Request
+
+from app import wechat_api, wechat_token
+from app.tenants import Tenant
+from app.wechat_api import WeChatAPIError, call_wechat_api
+
+TENANT = Tenant(name="brand_a", token="t", appid="appid-a", secret="secret-a")
+
+
+class FakeWeChatAPI:
+    def __init__(self) -> None:
+        self.app = FastAPI()
+        self.issued_tokens = 0
+        self.token_requests = 0
+        self.menu_requests: list[dict] = []
+        self.menu_errcodes: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app.get("/cgi-bin/token")(self.token)
+        self.app.post("/cgi-bin/menu/create")(self.create_menu)
+        self.app.get("/cgi-bin/menu/get")(self.get_menu)
+        self.get_menu_requests = 0
+
+    async def token(self, appid: str, secret: str, grant_type: str):
+        self.token_requests += 1
+        await asyncio.sleep(0.01)
+        self.issued_tokens += 1
+        return {"access_token": f"token-{self.issued_tokens}", "expires_in": 7200}
+
+    async def create_menu(self, request: Request, access_token: str):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.menu_requests.append({"access_token": access_token, "raw": await request.body()})
+            if self.menu_errcodes:
+                errcode = self.menu_errcodes.pop(0)
+                return {"errcode": errcode, "errmsg": f"error {errcode}"}
+            return {"errcode": 0, "errmsg": "ok"}
+        finally:
+            self.in_flight -= 1
+
+    async def get_menu(self, access_token: str):
+        self.get_menu_requests += 1
+        return {"errcode": 0, "errmsg": "ok", "access_token": access_token}
+
+
+class WeChatAPIClientTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.fake = FakeWeChatAPI()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=self.fake.app))
+        self._patches = [
+            mock.patch("app.wechat_api.get_http_client", return_value=self.client),
+            mock.patch("app.wechat_api.WECHAT_API_BASE_URL", "http://wechat.test"),
+            mock.patch("app.wechat_api.WECHAT_API_RETRY_BASE_SECONDS", 0.001),
+            mock.patch("app.wechat_api.WECHAT_API_MAX_CONCURRENCY", 2),
+            mock.patch.object(wechat_api, "_concurrency", None),
+            mock.patch.dict(wechat_api._rate_limiters, clear=True),
+            mock.patch.dict(wechat_api._quota_exhausted_until, clear=True),
+            mock.patch.dict(wechat_token._tokens, clear=True),
+            mock.patch.dict(wechat_token._refresh_locks, clear=True),
+        ]
+        for patch in self._patches:
+            patch.start()
+
+    async def asyncTearDown(self) -> None:
+        for patch in reversed(self._patches):
+            patch.stop()
+        await self.client.aclose()
+
+    async def test_token_is_injected_and_cached(self) -> None:
+        await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={"button": []})
+        await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={"button": []})
+
+        self.assertEqual(self.fake.token_requests, 1)
+        self.assertEqual(
+            [item["access_token"] for item in self.fake.menu_requests],
+            ["token-1", "token-1"],
+        )
+
+    async def test_expired_token_is_refreshed_once_and_retried(self) -> None:
+        self.fake.menu_errcodes = [42001]
+
+        data = await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={})
+
+        self.assertEqual(data["errcode"], 0)
+        self.assertEqual(self.fake.token_requests, 2)
+        self.assertEqual(
+            [item["access_token"] for item in self.fake.menu_requests],
+            ["token-1", "token-2"],
+        )
+
+    async def test_token_error_after_refresh_is_raised(self) -> None:
+        self.fake.menu_errcodes = [40001, 40001]
+
+        with self.assertRaises(WeChatAPIError) as ctx:
+            await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={})
+
+        self.assertEqual(ctx.exception.errcode, 40001)
+        self.assertEqual(len(self.fake.menu_requests), 2)
+
+    async def test_throttling_errcode_is_retried_with_backoff(self) -> None:
+        self.fake.menu_errcodes = [45011, -1]
+
+        data = await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={})
+
+        self.assertEqual(data["errcode"], 0)
+        self.assertEqual(len(self.fake.menu_requests), 3)
+
+    async def test_daily_quota_errcode_stops_further_calls(self) -> None:
+        self.fake.menu_errcodes = [45009]
+
+        for _ in range(2):
+            with self.assertRaises(WeChatAPIError) as ctx:
+                await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={})
+            self.assertEqual(ctx.exception.errcode, 45009)
+
+        self.assertEqual(len(self.fake.menu_requests), 1)
+
+    async def test_daily_quota_on_one_api_does_not_block_other_apis(self) -> None:
+        self.fake.menu_errcodes = [45009]
+
+        with self.assertRaises(WeChatAPIError):
+            await call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={})
+
+        # Force a real token refresh inside the cooldown window.
+        wechat_token._tokens.clear()
+        data = await call_wechat_api(TENANT, "GET", "/cgi-bin/menu/get")
+
+        self.assertEqual(data["errcode"], 0)
+        self.assertEqual(data["access_token"], "token-2")
+        self.assertEqual(self.fake.token_requests, 2)
+        self.assertEqual(self.fake.get_menu_requests, 1)
+
+    async def test_burst_is_bounded_and_shares_one_token_fetch(self) -> None:
+        await asyncio.gather(
+            *(
+                call_wechat_api(TENANT, "POST", "/cgi-bin/menu/create", json_body={"n": index})
+                for index in range(6)
+            )
+        )
+
+        self.assertEqual(self.fake.token_requests, 1)
+        self.assertEqual(len(self.fake.menu_requests), 6)
+        self.assertLessEqual(self.fake.max_in_flight, 2)
+
+    async def test_json_body_keeps_utf8_text(self) -> None:
+        await call_wechat_api(
+            TENANT,
+            "POST",
+            "/cgi-bin/menu/create",
+            json_body={"name": "\u5e2e\u52a9"},
+        )
+
+        self.assertIn("\u5e2e\u52a9".encode("utf-8"), self.fake.menu_requests[0]["raw"])
+
+
+if __name__ == "__main__":
+    unittest.main()